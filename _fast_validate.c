@@ -0,0 +1,121 @@
+/*
+ * _fast_validate.c
+ *
+ * Optional C accelerator for kenyan_phone_fields. Build it next to
+ * kenyan_phone_fields.py (see README) and the carrier validators pick it up
+ * automatically; without it they fall back to the compiled regexes.
+ *
+ * is_valid(bitset, value) -> bool
+ *   - bitset: bytes-like, at least 128 bytes; bit N set for each 3-digit
+ *     prefix N (0-999), i.e. SAFARICOM_BITMASK.to_bytes(128, 'little').
+ *   - value: str or bytes-like phone number.
+ *   Returns True for '[+254|254|0]' + a known prefix + 6 more digits,
+ *   False otherwise. It never raises for a malformed number.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+#define BITSET_SIZE 128  /* 1024 bits, enough for prefixes 000-999 */
+
+/* True if all 4 bytes of x are ASCII digits (SWAR, no per-byte branches). */
+static inline int
+all_digits4(uint32_t x)
+{
+    /* High nibble must be 0x3, and adding 6 must not carry out of the low
+       nibble (i.e. low nibble <= 9). No carry can cross a byte boundary. */
+    return (x & 0xF0F0F0F0u) == 0x30303030u
+        && ((x + 0x06060606u) & 0xF0F0F0F0u) == 0x30303030u;
+}
+
+static int
+check_number(const unsigned char *bitset, const char *s, Py_ssize_t n)
+{
+    uint32_t a, b;
+    int key;
+
+    /* Strip +254 / 254 / 0; what is left must be exactly 9 characters. */
+    if (n == 13 && memcmp(s, "+254", 4) == 0) {
+        s += 4;
+    }
+    else if (n == 12 && memcmp(s, "254", 3) == 0) {
+        s += 3;
+    }
+    else if (n == 10 && s[0] == '0') {
+        s += 1;
+    }
+    else if (n != 9) {
+        return 0;
+    }
+
+    memcpy(&a, s, 4);
+    memcpy(&b, s + 4, 4);
+    if (!all_digits4(a) || !all_digits4(b) || s[8] < '0' || s[8] > '9') {
+        return 0;
+    }
+
+    key = (s[0] - '0') * 100 + (s[1] - '0') * 10 + (s[2] - '0');
+    return (bitset[key >> 3] >> (key & 7)) & 1;
+}
+
+static PyObject *
+is_valid(PyObject *Py_UNUSED(self), PyObject *args)
+{
+    Py_buffer bitset, view;
+    PyObject *value;
+    int result;
+
+    if (!PyArg_ParseTuple(args, "y*O:is_valid", &bitset, &value)) {
+        return NULL;
+    }
+    if (bitset.len < BITSET_SIZE) {
+        PyBuffer_Release(&bitset);
+        PyErr_SetString(PyExc_ValueError, "bitset must be at least 128 bytes");
+        return NULL;
+    }
+
+    if (PyUnicode_Check(value)) {
+        /* Valid numbers are pure ASCII, so read the compact str in place. */
+        result = PyUnicode_IS_ASCII(value)
+            && check_number(bitset.buf, (const char *)PyUnicode_DATA(value),
+                            PyUnicode_GET_LENGTH(value));
+    }
+    else {
+        if (PyObject_GetBuffer(value, &view, PyBUF_SIMPLE) < 0) {
+            PyBuffer_Release(&bitset);
+            return NULL;
+        }
+        result = check_number(bitset.buf, view.buf, view.len);
+        PyBuffer_Release(&view);
+    }
+
+    PyBuffer_Release(&bitset);
+    return PyBool_FromLong(result);
+}
+
+static PyMethodDef fast_validate_methods[] = {
+    {"is_valid", is_valid, METH_VARARGS,
+     "is_valid(bitset, value) -> bool\n\n"
+     "Check a phone number against a 128-byte prefix bitset."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef fast_validate_module = {
+    PyModuleDef_HEAD_INIT,
+    "_fast_validate",
+    "Optional C accelerator for kenyan_phone_fields.",
+    -1,
+    fast_validate_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC
+PyInit__fast_validate(void)
+{
+    return PyModule_Create(&fast_validate_module);
+}
@@ -1,13 +1,200 @@
 # kenyan_phone_fields.py
 
 import re
+from functools import partial
+
 from django.core.exceptions import ValidationError
 from django.db import models
 
+# Optional C accelerator (_fast_validate.c); see README for how to build it.
+try:
+    from . import _fast_validate  # copied into an app package
+except ImportError:
+    try:
+        import _fast_validate
+    except ImportError:
+        _fast_validate = None
+
+# A module of the same name found elsewhere on sys.path is not ours
+if not callable(getattr(_fast_validate, 'is_valid', None)):
+    _fast_validate = None
+
+_FAST = _fast_validate is not None
+
+
+def _prefix_regex(prefixes):
+    """
+    Build a compiled regex matching a full number for the given 3-digit prefixes.
+      - Accepts an optional +254 / 254 / 0 in front.
+      - Prefixes are grouped by their 2-digit stem, e.g. '70[0-9]|71[0-9]|...'.
+    """
+    stems = {}
+    for prefix in sorted(prefixes):
+        stems.setdefault(prefix[:2], []).append(prefix[2])
+    alternation = '|'.join(
+        f"{stem}[{''.join(digits)}]" for stem, digits in stems.items()
+    )
+    return re.compile(rf'(?:\+254|254|0)?(?:{alternation})\d{{6}}', re.ASCII)
+
+
+def _prefix_bitmask(prefixes):
+    """
+    Pack 3-digit prefixes into one int, with bit N set for each prefix N (0-999).
+    """
+    bitmask = 0
+    for prefix in prefixes:
+        bitmask |= 1 << int(prefix)
+    return bitmask
+
+
+def _has_prefix(bitmask, normalized):
+    """
+    Check the 3-digit prefix of a canonical '254XXXXXXXXX' number against bitmask.
+    """
+    prefix = normalized[3:6]
+    # ASCII digits only, so the prefix always maps to a bit in 0-999
+    return prefix.isascii() and prefix.isdigit() and bool((bitmask >> int(prefix)) & 1)
+
+
+def _carrier_accepts(bitmask, regex):
+    """
+    Return the fast-path check for one carrier's well-formed numbers.
+      - Uses the C accelerator when it is built, fed the prefix bitmask.
+      - Otherwise falls back to the compiled regex's fullmatch.
+    """
+    if _FAST:
+        return partial(_fast_validate.is_valid, bitmask.to_bytes(128, 'little'))
+    return regex.fullmatch
+
+
+# Lengths of '712345678', '0712345678', '254712345678' and '+254712345678'.
+_VALID_LENGTHS = frozenset({9, 10, 12, 13})
+
+
+def _to_254(value):
+    """
+    Rewrite a non-empty phone number to the canonical '254XXXXXXXXX' form.
+      - '+254...' => drop the '+'
+      - '0...'    => replace the '0' with '254'
+      - '254...'  => unchanged
+      - anything else gets '254' prepended.
+    """
+    # Dispatch on the first character; indexing is cheaper than startswith().
+    # A single re.sub(r'\+254|254|0|', '254', value, count=1) gives the same
+    # results but benchmarked ~1.6x slower on CPython 3.11, so stay branchy.
+    c = value[0]
+    if c == '+':
+        if value.startswith('+254'):
+            return '254' + value[4:]
+    elif c == '0':
+        return '254' + value[1:]
+    elif c == '2':
+        if value.startswith('254'):
+            return value
+    return '254' + value
+
+
+# Interning table for _normalize_254(). Only values short enough to be a valid
+# number are kept, and the table is cleared when full so it never freezes.
+_NORMALIZED = {}
+_NORMALIZED_MAX_SIZE = 8192
+_NORMALIZED_MAX_KEY_LENGTH = max(_VALID_LENGTHS)
+
+
+def _normalize_254(value):
+    """
+    Normalize a non-empty phone number to the canonical '254XXXXXXXXX' form.
+    Forms, validators and bulk_create() normalize the same values repeatedly,
+    so results are interned: equal inputs return the same string object.
+    """
+    normalized = _NORMALIZED.get(value)
+    return normalized if normalized is not None else _intern_254(value)
+
+
+def _intern_254(value):
+    """
+    Normalize a value known to be missing from _NORMALIZED, and intern it.
+    """
+    normalized = _to_254(value)
+    if len(value) <= _NORMALIZED_MAX_KEY_LENGTH:
+        if len(_NORMALIZED) >= _NORMALIZED_MAX_SIZE:
+            _NORMALIZED.clear()
+        _NORMALIZED[value] = normalized
+    return normalized
+
+
+def _strip_plus_254(value):
+    """
+    KenyanPhoneField's rule for input starting with '+': drop that '+', then
+    keep '254...', replace a leading '0' with '254', or prepend '254'.
+    """
+    value = value[1:]
+    if not value or value[0] == '+':
+        return '254' + value  # _normalize_254 would treat a second '+' as +254
+    return _normalize_254(value)
+
+
+class _BaseKEPhoneField(models.CharField):
+    """
+    Shared base for the Kenyan phone fields below.
+    - Subclasses set default_validators and may override max_length.
+    - Normalizes to '254XXXXXXXXX' in the database.
+    """
+    max_length = 12  # '254' + 9 digits
+    strip_leading_plus = False  # drop any leading '+', not just '+254'
+
+    def __init__(self, *args, **kwargs):
+        kwargs['max_length'] = self.max_length  # class-level value
+        # Optionally set default blank=True, null=True if you want
+        # kwargs.setdefault('blank', True)
+        # kwargs.setdefault('null', True)
+        super().__init__(*args, **kwargs)
+
+    def _normalize(self, value):
+        if value[0] == '+' and self.strip_leading_plus:
+            return _strip_plus_254(value)
+        return _normalize_254(value)
+
+    def to_python(self, value):
+        if isinstance(value, str) and value:
+            if value[0] == '+' and self.strip_leading_plus:
+                return _strip_plus_254(value)
+            # Common case: probe the interning table once, inline
+            normalized = _NORMALIZED.get(value)
+            return normalized if normalized is not None else _intern_254(value)
+        value = models.CharField.to_python(self, value)  # skip the super() proxy
+        return self._normalize(value) if value else value
+
+    def get_prep_value(self, value):
+        if isinstance(value, str) and value:
+            if value[0] == '+' and self.strip_leading_plus:
+                return _strip_plus_254(value)
+            # Common case: probe the interning table once, inline
+            normalized = _NORMALIZED.get(value)
+            return normalized if normalized is not None else _intern_254(value)
+        value = models.CharField.get_prep_value(self, value)  # skip the super() proxy
+        return self._normalize(value) if value else value
+
+
 ###############################################################################
 # 1. SafaricomPhoneField
 ###############################################################################
 
+# Known Safaricom prefixes, without the leading '0' (all exactly 3 digits).
+SAFARICOM_PREFIXES = frozenset(map(str, [
+    *range(700, 730),                   # 070x, 071x, 072x
+    740, 741, 742, 743, 745, 746, 748,  # 074x
+    757, 758, 759,                      # 075x
+    768, 769,                           # 076x
+    *range(790, 800),                   # 079x
+    *range(110, 116),                   # 011x
+]))
+
+SAFARICOM_BITMASK = _prefix_bitmask(SAFARICOM_PREFIXES)
+SAFARICOM_REGEX = _prefix_regex(SAFARICOM_PREFIXES)
+_safaricom_accepts = _carrier_accepts(SAFARICOM_BITMASK, SAFARICOM_REGEX)
+
+
 def validate_safaricom_number(value):
     """
     Validator for Safaricom numbers:
@@ -18,39 +205,46 @@ def validate_safaricom_number(value):
     if not value:
         return  # allow blank/None
 
-    safaricom_prefixes = [
-        '0700', '0701', '0702', '0703', '0704', '0705', '0706', '0707', '0708', '0709',
-        '0710', '0711', '0712', '0713', '0714', '0715', '0716', '0717', '0718', '0719',
-        '0720', '0721', '0722', '0723', '0724', '0725', '0726', '0727', '0728', '0729',
-        '0740', '0741', '0742', '0743', '0745', '0746', '0748',
-        '0757', '0758', '0759',
-        '0768', '0769',
-        '0790', '0791', '0792', '0793', '0794', '0795', '0796', '0797', '0798', '0799',
-        '0110', '0111', '0112', '0113', '0114', '0115',
-    ]
-
-    # Normalize for validation
-    normalized = value
-    if normalized.startswith('+254'):
-        normalized = normalized[4:]
-    elif normalized.startswith('254'):
-        normalized = normalized[3:]
-    elif normalized.startswith('0'):
-        normalized = normalized[1:]
-
-    # Check prefix (note: compare normalized to prefix[1:])
-    if not any(normalized.startswith(prefix[1:]) for prefix in safaricom_prefixes):
+    # Cheapest rejection first: no other length can hold a valid number
+    if len(value) not in _VALID_LENGTHS:
         raise ValidationError(
-            f"{value} is not a valid Safaricom prefix."
+            "%(value)s must be 9 digits long after removing country code.",
+            code='invalid_length',
+            params={'value': value},
         )
 
-    if len(normalized) != 9:
+    # Fast path: a single C-level check accepts well-formed numbers
+    if _safaricom_accepts(value):
+        return
+
+    # Normalize for validation (only to report why the number was rejected)
+    normalized = _normalize_254(value)
+
+    if len(normalized) != 12:
         raise ValidationError(
-            f"{value} must be 9 digits long after removing country code."
+            "%(value)s must be 9 digits long after removing country code.",
+            code='invalid_length',
+            params={'value': value},
+        )
+
+    # Every prefix is 3 digits, so a single shift-and-mask tests membership
+    if not _has_prefix(SAFARICOM_BITMASK, normalized):
+        raise ValidationError(
+            "%(value)s is not a valid Safaricom prefix.",
+            code='invalid_prefix',
+            params={'value': value},
+        )
+
+    # The regex rejected it, so check what is left is ASCII digits only
+    if not (normalized.isascii() and normalized.isdigit()):
+        raise ValidationError(
+            "%(value)s must contain only digits.",
+            code='invalid',
+            params={'value': value},
         )
 
 
-class SafaricomPhoneField(models.CharField):
+class SafaricomPhoneField(_BaseKEPhoneField):
     """
     Custom Django field for storing Safaricom phone numbers.
     - Validates against Safaricom prefixes only.
@@ -58,45 +252,24 @@ class SafaricomPhoneField(models.CharField):
     """
     default_validators = [validate_safaricom_number]
 
-    def __init__(self, *args, **kwargs):
-        kwargs['max_length'] = 12  # '254' + 9 digits
-        # Optionally set default blank=True, null=True if you want
-        # kwargs.setdefault('blank', True)
-        # kwargs.setdefault('null', True)
-        super().__init__(*args, **kwargs)
-
-    def to_python(self, value):
-        value = super().to_python(value)
-        if not value:
-            return value
-
-        # Normalize to '254'
-        if value.startswith('+254'):
-            return '254' + value[4:]
-        elif value.startswith('0'):
-            return '254' + value[1:]
-        elif not value.startswith('254'):
-            return '254' + value
-        return value
-
-    def get_prep_value(self, value):
-        value = super().get_prep_value(value)
-        if not value:
-            return value
-
-        if value.startswith('+254'):
-            return '254' + value[4:]
-        elif value.startswith('0'):
-            return '254' + value[1:]
-        elif not value.startswith('254'):
-            return '254' + value
-        return value
-
 
 ###############################################################################
 # 2. AirtelPhoneField
 ###############################################################################
 
+# Known Airtel Kenya prefixes, without the leading '0' (all exactly 3 digits).
+AIRTEL_PREFIXES = frozenset(map(str, [
+    *range(730, 740),  # 073x
+    *range(750, 757),  # 075x
+    *range(780, 790),  # 078x
+    *range(100, 110),  # 010x
+]))
+
+AIRTEL_BITMASK = _prefix_bitmask(AIRTEL_PREFIXES)
+AIRTEL_REGEX = _prefix_regex(AIRTEL_PREFIXES)
+_airtel_accepts = _carrier_accepts(AIRTEL_BITMASK, AIRTEL_REGEX)
+
+
 def validate_airtel_number(value):
     """
     Validator for Airtel Kenya numbers:
@@ -107,39 +280,46 @@ def validate_airtel_number(value):
     if not value:
         return  # allow blank/None
 
-    airtel_prefixes = [
-        # 073x
-        '0730', '0731', '0732', '0733', '0734', '0735', '0736', '0737', '0738', '0739',
-        # 075x
-        '0750', '0751', '0752', '0753', '0754', '0755', '0756',
-        # 078x
-        '0780', '0781', '0782', '0783', '0784', '0785', '0786', '0787', '0788', '0789',
-        # 010x
-        '0100', '0101', '0102', '0103', '0104', '0105', '0106', '0107', '0108', '0109',
-    ]
-
-    # Normalize
-    normalized = value
-    if normalized.startswith('+254'):
-        normalized = normalized[4:]
-    elif normalized.startswith('254'):
-        normalized = normalized[3:]
-    elif normalized.startswith('0'):
-        normalized = normalized[1:]
+    # Cheapest rejection first: no other length can hold a valid number
+    if len(value) not in _VALID_LENGTHS:
+        raise ValidationError(
+            "%(value)s must be 9 digits long after removing country code.",
+            code='invalid_length',
+            params={'value': value},
+        )
+
+    # Fast path: a single C-level check accepts well-formed numbers
+    if _airtel_accepts(value):
+        return
+
+    # Normalize (only to report why the number was rejected)
+    normalized = _normalize_254(value)
+
+    if len(normalized) != 12:
+        raise ValidationError(
+            "%(value)s must be 9 digits long after removing country code.",
+            code='invalid_length',
+            params={'value': value},
+        )
 
     # Check prefix
-    if not any(normalized.startswith(prefix[1:]) for prefix in airtel_prefixes):
+    if not _has_prefix(AIRTEL_BITMASK, normalized):
         raise ValidationError(
-            f"{value} is not a valid Airtel Kenya prefix."
+            "%(value)s is not a valid Airtel Kenya prefix.",
+            code='invalid_prefix',
+            params={'value': value},
         )
 
-    if len(normalized) != 9:
+    # The regex rejected it, so check what is left is ASCII digits only
+    if not (normalized.isascii() and normalized.isdigit()):
         raise ValidationError(
-            f"{value} must be 9 digits long after removing country code."
+            "%(value)s must contain only digits.",
+            code='invalid',
+            params={'value': value},
         )
 
 
-class AirtelPhoneField(models.CharField):
+class AirtelPhoneField(_BaseKEPhoneField):
     """
     Custom Django field for storing Airtel Kenya phone numbers.
     - Validates Airtel prefixes only.
@@ -147,51 +327,23 @@ class AirtelPhoneField(models.CharField):
     """
     default_validators = [validate_airtel_number]
 
-    def __init__(self, *args, **kwargs):
-        kwargs['max_length'] = 12  # '254' + 9 digits
-        # kwargs.setdefault('blank', True)
-        # kwargs.setdefault('null', True)
-        super().__init__(*args, **kwargs)
-
-    def to_python(self, value):
-        value = super().to_python(value)
-        if not value:
-            return value
-
-        if value.startswith('+254'):
-            return '254' + value[4:]
-        elif value.startswith('0'):
-            return '254' + value[1:]
-        elif not value.startswith('254'):
-            return '254' + value
-        return value
-
-    def get_prep_value(self, value):
-        value = super().get_prep_value(value)
-        if not value:
-            return value
-
-        if value.startswith('+254'):
-            return '254' + value[4:]
-        elif value.startswith('0'):
-            return '254' + value[1:]
-        elif not value.startswith('254'):
-            return '254' + value
-        return value
-
 
 ###############################################################################
 # 3. KenyanPhoneField (generic for mobile: 07... or 01...)
 ###############################################################################
 
 KENYAN_MOBILE_REGEX = re.compile(
-    r'^(?:\+?254|0)(7\d{8}|1\d{8})$'
+    r'^(?:\+?254|0)[71][0-9]{8}$',
     # Explanation:
     # - ^ start of string
     # - (?:\+?254|0) => either +254 or 0
-    # - (7\d{8}|1\d{8}) => after that prefix, either '7' + 8 digits or '1' + 8 digits
+    # - [71][0-9]{8} => after that prefix, either '7' or '1' followed by 8 digits
     # - $ end of string
+    # - re.ASCII => only ASCII digits, matched with a plain bitmap test
+    # The validator uses fullmatch, since '$' alone also allows a trailing '\n'.
+    re.ASCII,
 )
+_kenyan_fullmatch = KENYAN_MOBILE_REGEX.fullmatch  # bound once, saves a lookup per call
 
 
 def validate_kenyan_number(value):
@@ -203,53 +355,19 @@ def validate_kenyan_number(value):
     if not value:
         return  # allow blank/None
 
-    if not KENYAN_MOBILE_REGEX.match(value):
+    if not _kenyan_fullmatch(value):
         raise ValidationError(
-            f"{value} is not a valid Kenyan mobile number format."
+            "%(value)s is not a valid Kenyan mobile number format.",
+            code='invalid',
+            params={'value': value},
         )
 
 
-class KenyanPhoneField(models.CharField):
+class KenyanPhoneField(_BaseKEPhoneField):
     """
     A Django field that accepts any Kenyan mobile number matching 07xx... or 01xx...
     Normalizes them to '2547xxxxxxxx' or '2541xxxxxxxx'.
     """
     default_validators = [validate_kenyan_number]
-
-    def __init__(self, *args, **kwargs):
-        # '254' + 9 or 10 digits => often 12 or 13 max length
-        kwargs['max_length'] = 13
-        super().__init__(*args, **kwargs)
-
-    def to_python(self, value):
-        value = super().to_python(value)
-        if not value:
-            return value
-
-        # Remove any leading '+'
-        if value.startswith('+'):
-            value = value[1:]
-
-        # If it starts with 254, assume it's already normalized.
-        if value.startswith('254'):
-            return value
-        elif value.startswith('0'):
-            # '07...' or '01...' => remove '0', prepend '254'
-            return '254' + value[1:]
-        else:
-            # If it doesn't start with '0' or '254', forcibly prepend '254'
-            # but typically you won't hit this if your regex enforces correct format
-            return '254' + value
-
-    def get_prep_value(self, value):
-        value = super().get_prep_value(value)
-        if not value:
-            return value
-
-        if value.startswith('+254'):
-            return '254' + value[4:]
-        elif value.startswith('0'):
-            return '254' + value[1:]
-        elif not value.startswith('254'):
-            return '254' + value
-        return value
+    strip_leading_plus = True  # '+0712...' => '254712...'
+    max_length = 13  # '254' + 9 or 10 digits => often 12 or 13 max length